@@ -1,25 +1,281 @@
 from __future__ import annotations
 
-from typing import Generator
+import itertools
+import logging
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from .config import get_settings
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+Base = declarative_base()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-)
+# Engine and session factory are created lazily (normally from the app lifespan)
+# so importing this module never opens a connection.
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_replica_router: Optional["ReplicaRouter"] = None
+_replica_lock = threading.Lock()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sync driver -> async driver used when ASYNC_DATABASE_URL is not set.
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
 
-Base = declarative_base()
+
+def _to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    if driver is None:
+        raise ValueError(f"No async driver known for {url.drivername!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _engine_kwargs(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    settings = get_settings()
+    if database_url.startswith("sqlite"):
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "connect_args": {"connect_timeout": settings.db_connect_timeout},
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+def init_engine() -> Engine:
+    """Create the global engine and session factory if they do not exist yet."""
+    global _engine, _session_factory
+    if _engine is None:
+        database_url = get_settings().database_url
+        _engine = create_engine(database_url, **_engine_kwargs(database_url))
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
+
+
+def get_engine() -> Engine:
+    return init_engine()
+
+
+def SessionLocal():
+    init_engine()
+    return _session_factory()
+
+
+def warm_up_pool(connections: int) -> None:
+    """
+    Check out `connections` pooled connections at once and return them, so the
+    first requests do not pay for TCP/auth handshakes.
+    """
+    if connections <= 0:
+        return
+
+    engine = get_engine()
+    # Never hold more than the steady-state pool, otherwise overflow
+    # connections would be opened and immediately discarded.
+    pool_size = getattr(engine.pool, "size", None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    logger.info("database pool warmed up", extra={"connections": len(opened)})
+
+
+def init_async_engine() -> AsyncEngine:
+    """Async counterpart of init_engine(), used by the async papers router."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        settings = get_settings()
+        database_url = settings.async_database_url or _to_async_url(settings.database_url)
+        _async_engine = create_async_engine(database_url, **_engine_kwargs(database_url, is_async=True))
+        # expire_on_commit=False: attributes stay readable after commit without
+        # an implicit (and, under asyncio, illegal) lazy refresh.
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    init_async_engine()
+    return _async_session_factory()
+
+
+async def warm_up_async_pool(connections: int) -> None:
+    if connections <= 0:
+        return
+
+    engine = init_async_engine()
+    pool_size = getattr(engine.pool, "size", None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = await engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            await conn.close()
+    logger.info("async database pool warmed up", extra={"connections": len(opened)})
+
+
+# ---- read replicas ----
+
+
+class _Replica:
+    """One read replica: lazily created sync/async engines plus health state."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.down_until = 0.0
+        self.latency: Optional[float] = None  # EWMA of checkout time, seconds
+        self._session_factory: Optional[sessionmaker] = None
+        self._async_session_factory: Optional[async_sessionmaker] = None
+        self.engine: Optional[Engine] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        # Sync reads open sessions from threadpool workers; without the lock two
+        # concurrent first reads would each build an engine and leak one pool.
+        self._lock = threading.Lock()
+
+    def session(self):
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self.engine = create_engine(self.url, **_engine_kwargs(self.url))
+                    self._session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        return self._session_factory()
+
+    def async_session(self):
+        if self._async_session_factory is None:
+            with self._lock:
+                if self._async_session_factory is None:
+                    url = _to_async_url(self.url)
+                    self.async_engine = create_async_engine(url, **_engine_kwargs(url, is_async=True))
+                    self._async_session_factory = async_sessionmaker(
+                        bind=self.async_engine,
+                        autoflush=False,
+                        expire_on_commit=False,
+                    )
+        return self._async_session_factory()
+
+
+class ReplicaRouter:
+    """
+    Chooses a read replica per request.
+
+    A replica whose connection checkout fails is skipped for `retry_seconds`, then
+    tried again; when no replica is usable, reads fall back to the primary.
+    """
+
+    def __init__(self, urls: List[str], strategy: str, retry_seconds: float) -> None:
+        self.replicas = [_Replica(url) for url in urls]
+        self.strategy = strategy
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+
+    def candidates(self) -> List[_Replica]:
+        now = time.monotonic()
+        healthy = [r for r in self.replicas if r.down_until <= now]
+        if not healthy:
+            return []
+        if self.strategy == "least_latency":
+            # Unmeasured replicas sort first so every replica gets sampled.
+            return sorted(healthy, key=lambda r: -1.0 if r.latency is None else r.latency)
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, replica: _Replica, exc: Exception) -> None:
+        replica.down_until = time.monotonic() + self.retry_seconds
+        logger.warning(
+            "read replica unavailable, failing over",
+            extra={"replica": _safe_url(replica.url), "error": str(exc)},
+        )
+
+    def record_latency(self, replica: _Replica, seconds: float) -> None:
+        if replica.latency is None:
+            replica.latency = seconds
+        else:
+            replica.latency = 0.8 * replica.latency + 0.2 * seconds
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.engine is not None:
+                replica.engine.dispose()
+
+    async def dispose_async(self) -> None:
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+def _safe_url(url: str) -> str:
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """Return the replica router, or None when no DATABASE_REPLICA_URLS are set."""
+    global _replica_router
+    settings = get_settings()
+    if not settings.database_replica_urls:
+        return None
+    if _replica_router is None:
+        with _replica_lock:
+            if _replica_router is None:
+                _replica_router = ReplicaRouter(
+                    settings.database_replica_urls,
+                    settings.db_replica_strategy,
+                    settings.db_replica_retry_seconds,
+                )
+    return _replica_router
+
+
+def dispose_engine() -> None:
+    global _engine, _session_factory
+    if _engine is not None:
+        _engine.dispose()
+    if _replica_router is not None:
+        _replica_router.dispose()
+    _engine = None
+    _session_factory = None
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _replica_router is not None:
+        await _replica_router.dispose_async()
+    _async_engine = None
+    _async_session_factory = None
 
 
 def get_db() -> Generator:
@@ -29,3 +285,51 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+
+def open_read_session(use_primary: bool = False):
+    """Session for read-only work: a healthy replica, else the primary."""
+    router = get_replica_router()
+    if router is None or use_primary:
+        return SessionLocal()
+
+    for replica in router.candidates():
+        db = replica.session()
+        started = time.perf_counter()
+        try:
+            # Check out a connection now so a dead replica fails over here,
+            # not halfway through the handler.
+            db.connection()
+        except DBAPIError as exc:
+            db.close()
+            router.mark_down(replica, exc)
+            continue
+        router.record_latency(replica, time.perf_counter() - started)
+        return db
+
+    return SessionLocal()
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def open_async_read_session(use_primary: bool = False):
+    router = get_replica_router()
+    if router is None or use_primary:
+        return AsyncSessionLocal()
+
+    for replica in router.candidates():
+        db = replica.async_session()
+        started = time.perf_counter()
+        try:
+            await db.connection()
+        except DBAPIError as exc:
+            await db.close()
+            router.mark_down(replica, exc)
+            continue
+        router.record_latency(replica, time.perf_counter() - started)
+        return db
+
+    return AsyncSessionLocal()
+
@@ -1,25 +1,90 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from .config import get_settings
-from .database import Base, engine
-from .routers import papers, search
+from .database import (
+    Base,
+    SessionLocal,
+    dispose_async_engine,
+    dispose_engine,
+    init_engine,
+    warm_up_async_pool,
+    warm_up_pool,
+)
+from .routers import papers, papers_sync, search, suggest
+from .suggestions import build_indexes
+from .utils.arxiv_client import warm_up_connection
+from .utils.arxiv_scheduler import get_scheduler
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
 )
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-# Create tables on startup for local development.
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Arxiv Search & Save Demo", version="0.1.0")
+def _rebuild_suggestions() -> None:
+    db = SessionLocal()
+    try:
+        build_indexes(db)
+    finally:
+        db.close()
+
+
+async def _resync_suggestions(interval: float) -> None:
+    """Pick up other workers' writes, which this process's session events never see."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_rebuild_suggestions)
+        except Exception:  # noqa: BLE001
+            logger.exception("suggest index resync failed")
+
+
+def _startup() -> None:
+    engine = init_engine()
+    # Create tables on startup for local development.
+    if settings.db_create_tables:
+        Base.metadata.create_all(bind=engine)
+    if not settings.db_async:
+        warm_up_pool(settings.db_warmup_connections)
+    if settings.suggest_build_on_startup:
+        _rebuild_suggestions()
+    if settings.arxiv_warmup_connection:
+        # Resolve DNS and finish the TLS handshake so the first search does not pay for it.
+        warm_up_connection()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(_startup)
+    if settings.db_async:
+        await warm_up_async_pool(settings.db_warmup_connections)
+    resync = None
+    if settings.suggest_resync_seconds > 0:
+        resync = asyncio.create_task(_resync_suggestions(settings.suggest_resync_seconds))
+    logger.info("startup complete")
+    yield
+    if resync is not None:
+        resync.cancel()
+        await asyncio.gather(resync, return_exceptions=True)
+    await get_scheduler().stop()
+    if settings.db_async:
+        await dispose_async_engine()
+    await run_in_threadpool(dispose_engine)
+
+
+app = FastAPI(title="Arxiv Search & Save Demo", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,7 +95,8 @@ app.add_middleware(
 )
 
 app.include_router(search.router)
-app.include_router(papers.router)
+app.include_router(papers.router if settings.db_async else papers_sync.router)
+app.include_router(suggest.router)
 
 
 @app.get("/api/health")
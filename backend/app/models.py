@@ -7,6 +7,7 @@ from sqlalchemy import (
     String,
     Text,
     BigInteger,
+    Integer,
     DateTime,
     ForeignKey,
     UniqueConstraint,
@@ -16,6 +17,9 @@ from sqlalchemy.orm import relationship
 
 from .database import Base
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns; keep BIGINT elsewhere.
+BigIntPK = BigInteger().with_variant(Integer(), "sqlite")
+
 
 class Paper(Base):
     __tablename__ = "papers"
@@ -25,7 +29,7 @@ class Paper(Base):
         Index("idx_papers_primary_category", "primary_category"),
     )
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigIntPK, primary_key=True, index=True)
     arxiv_id = Column(String(32), nullable=False)
     version = Column(String(16), nullable=True)
     title = Column(Text, nullable=False)
@@ -56,7 +60,7 @@ class SavedPaper(Base):
         Index("idx_saved_papers_created_at", "created_at"),
     )
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigIntPK, primary_key=True, index=True)
     paper_id = Column(BigInteger, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False)
     tags = Column(String(512), nullable=True)
     note = Column(Text, nullable=True)
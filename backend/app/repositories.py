@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import re
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional, Tuple
 
-from sqlalchemy import or_, desc, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, or_, desc, asc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 
 from . import schemas
 from .models import Paper, SavedPaper
@@ -107,22 +110,17 @@ def get_saved_with_paper(db: Session, saved_id: int) -> Optional[SavedPaper]:
     )
 
 
-def list_saved(
-    db: Session,
-    page: int,
-    page_size: int,
+def _saved_filters(
     keyword: Optional[str] = None,
     author: Optional[str] = None,
     category: Optional[str] = None,
     tag: Optional[str] = None,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
-) -> Tuple[List[SavedPaper], int]:
-    query = db.query(SavedPaper).join(Paper)
+) -> List[ColumnElement[bool]]:
+    criteria: List[ColumnElement[bool]] = []
 
     if keyword:
         pattern = f"%{keyword}%"
-        query = query.filter(
+        criteria.append(
             or_(
                 Paper.title.ilike(pattern),
                 Paper.summary.ilike(pattern),
@@ -131,16 +129,20 @@ def list_saved(
 
     if author:
         pattern = f"%{author}%"
-        query = query.filter(Paper.authors.ilike(pattern))
+        criteria.append(Paper.authors.ilike(pattern))
 
     if category:
         pattern = f"%{category}%"
-        query = query.filter(Paper.categories.ilike(pattern))
+        criteria.append(Paper.categories.ilike(pattern))
 
     if tag:
         pattern = f"%{tag}%"
-        query = query.filter(SavedPaper.tags.ilike(pattern))
+        criteria.append(SavedPaper.tags.ilike(pattern))
+
+    return criteria
+
 
+def _saved_order(sort_by: str, sort_order: str) -> ColumnElement:
     if sort_by == "published":
         sort_field = Paper.published
     elif sort_by == "updated":
@@ -149,7 +151,23 @@ def list_saved(
         sort_field = SavedPaper.created_at
 
     sort_fn = desc if sort_order == "desc" else asc
-    query = query.order_by(sort_fn(sort_field))
+    return sort_fn(sort_field)
+
+
+def list_saved(
+    db: Session,
+    page: int,
+    page_size: int,
+    keyword: Optional[str] = None,
+    author: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+) -> Tuple[List[SavedPaper], int]:
+    query = db.query(SavedPaper).join(Paper)
+    query = query.filter(*_saved_filters(keyword, author, category, tag))
+    query = query.order_by(_saved_order(sort_by, sort_order))
 
     total = query.count()
     offset = (page - 1) * page_size
@@ -157,7 +175,182 @@ def list_saved(
     return items, total
 
 
+_QUERY_TOKEN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def _local_terms(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Split a search field the way arXiv reads it: whitespace-separated terms that
+    must all match, "quoted phrases" kept whole, an explicit AND ignored.
+
+    Returns None for OR / ANDNOT, which a per-term substring filter cannot express.
+    """
+    terms: List[str] = []
+    for phrase, word in _QUERY_TOKEN.findall(value or ""):
+        if word in ("OR", "ANDNOT"):
+            return None
+        if word != "AND":
+            terms.append(phrase or word)
+    return terms
+
+
+def search_local_papers(
+    db: Session,
+    all_terms: Optional[str] = None,
+    title: Optional[str] = None,
+    abstract: Optional[str] = None,
+    author: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    id_list: Optional[List[str]] = None,
+    date_mode: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sort_by: str = "relevance",
+    sort_order: str = "descending",
+    limit: int = 20,
+) -> List[Paper]:
+    """
+    Best-effort search over locally stored papers, used when arXiv is unavailable.
+
+    Applies the same filters as the arXiv query (every term, categories, date
+    range) and the requested date sort; relevance falls back to newest first.
+    Returns [] for queries whose boolean operators it cannot honour, so callers
+    never present unfiltered rows as an answer.
+    """
+    query = db.query(Paper)
+
+    if id_list:
+        query = query.filter(Paper.arxiv_id.in_(id_list))
+
+    fields = (
+        (all_terms, (Paper.title, Paper.summary, Paper.authors)),
+        (title, (Paper.title,)),
+        (abstract, (Paper.summary,)),
+        (author, (Paper.authors,)),
+    )
+    for value, columns in fields:
+        terms = _local_terms(value)
+        if terms is None:
+            return []
+        for term in terms:
+            pattern = f"%{term}%"
+            query = query.filter(or_(*(column.ilike(pattern) for column in columns)))
+
+    if categories:
+        query = query.filter(or_(*(Paper.categories.ilike(f"%{c}%") for c in categories)))
+
+    date_column = Paper.updated if date_mode == "updated" else Paper.published
+    if date_mode and date_from:
+        query = query.filter(date_column >= datetime.combine(date_from, time.min))
+    if date_mode and date_to:
+        query = query.filter(date_column < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    sort_column = Paper.updated if sort_by == "lastUpdatedDate" else Paper.published
+    direction = asc if sort_order == "ascending" and sort_by != "relevance" else desc
+    return query.order_by(direction(sort_column)).limit(limit).all()
+
+
 def delete_saved(db: Session, saved: SavedPaper) -> None:
     db.delete(saved)
     db.flush()
 
+
+
+# ---- async variants (AsyncSession) ----
+# Same behaviour as the sync functions above. Relationships are never lazy-loaded
+# under AsyncSession, so SavedPaper.paper is always populated eagerly.
+
+
+async def upsert_paper_async(db: AsyncSession, payload: schemas.ArxivPaper) -> Paper:
+    result = await db.execute(select(Paper).where(Paper.arxiv_id == payload.arxiv_id))
+    paper = result.scalars().first()
+    if not paper:
+        paper = Paper(arxiv_id=payload.arxiv_id)
+        db.add(paper)
+
+    paper.version = payload.version
+    paper.title = payload.title
+    paper.summary = payload.summary
+    paper.authors = _dumps_list(payload.authors)
+    paper.primary_category = payload.primary_category
+    paper.categories = _dumps_list(payload.categories)
+    paper.published = payload.published
+    paper.updated = payload.updated
+    paper.pdf_url = payload.pdf_url
+    paper.abs_url = payload.abs_url
+    paper.doi = payload.doi
+    paper.journal_ref = payload.journal_ref
+
+    return paper
+
+
+async def save_paper_async(
+    db: AsyncSession,
+    payload: schemas.ArxivPaper,
+    tags: Optional[str],
+    note: Optional[str],
+) -> SavedPaper:
+    paper = await upsert_paper_async(db, payload)
+    await db.flush()  # ensure paper.id is available
+
+    result = await db.execute(
+        select(SavedPaper)
+        .join(Paper)
+        .options(contains_eager(SavedPaper.paper))
+        .where(SavedPaper.paper_id == paper.id)
+    )
+    saved = result.scalars().first()
+    if not saved:
+        saved = SavedPaper(paper_id=paper.id, paper=paper)
+        db.add(saved)
+
+    if tags is not None:
+        saved.tags = tags
+    if note is not None:
+        saved.note = note
+
+    await db.flush()
+    return saved
+
+
+async def get_saved_with_paper_async(db: AsyncSession, saved_id: int) -> Optional[SavedPaper]:
+    result = await db.execute(
+        select(SavedPaper)
+        .join(Paper)
+        .options(contains_eager(SavedPaper.paper))
+        .where(SavedPaper.id == saved_id)
+    )
+    return result.scalars().first()
+
+
+async def list_saved_async(
+    db: AsyncSession,
+    page: int,
+    page_size: int,
+    keyword: Optional[str] = None,
+    author: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+) -> Tuple[List[SavedPaper], int]:
+    stmt = (
+        select(SavedPaper)
+        .join(Paper)
+        .where(*_saved_filters(keyword, author, category, tag))
+    )
+
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    offset = (page - 1) * page_size
+    result = await db.execute(
+        stmt.options(contains_eager(SavedPaper.paper))
+        .order_by(_saved_order(sort_by, sort_order))
+        .offset(offset)
+        .limit(page_size)
+    )
+    return list(result.scalars().all()), total or 0
+
+
+async def delete_saved_async(db: AsyncSession, saved: SavedPaper) -> None:
+    await db.delete(saved)
+    await db.flush()
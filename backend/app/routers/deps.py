@@ -0,0 +1,45 @@
+"""
+Request-scoped database dependencies shared by the papers routers.
+
+database.py knows how to pick a replica; this module decides, per request,
+whether the client must read from the primary (read-your-writes pinning).
+"""
+from __future__ import annotations
+
+from typing import AsyncGenerator, Generator
+
+from fastapi import Request, Response
+
+from ..config import get_settings
+from ..database import get_replica_router, open_async_read_session, open_read_session
+
+# Set on responses to writes; while present, the client's reads use the primary.
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+
+def pin_primary(response: Response) -> None:
+    """Route this client's reads to the primary for a short while (read-your-writes)."""
+    seconds = get_settings().db_primary_pin_seconds
+    if seconds > 0 and get_replica_router() is not None:
+        response.set_cookie(PRIMARY_PIN_COOKIE, "1", max_age=seconds, httponly=True, samesite="lax")
+
+
+def _read_from_primary(request: Request) -> bool:
+    return PRIMARY_PIN_COOKIE in request.cookies
+
+
+def get_read_db(request: Request) -> Generator:
+    """Session for read-only endpoints: a healthy replica, else the primary."""
+    db = open_read_session(use_primary=_read_from_primary(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator:
+    db = await open_async_read_session(use_primary=_read_from_primary(request))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,20 +1,28 @@
+"""
+Async implementation of the /api/papers endpoints (the default, DB_ASYNC=true).
+
+papers_sync.py mirrors this router over sync sessions: any change to
+request/response shapes, validation, status codes or pinning must be made in
+both routers.
+"""
 from __future__ import annotations
 
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
-from ..database import get_db
+from ..database import get_async_db
 from ..repositories import (
-    delete_saved,
-    get_saved_with_paper,
-    list_saved,
-    save_paper,
+    delete_saved_async,
+    get_saved_with_paper_async,
+    list_saved_async,
+    save_paper_async,
     saved_to_schema,
 )
+from .deps import get_async_read_db, pin_primary
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +30,20 @@ router = APIRouter(prefix="/api/papers", tags=["papers"])
 
 
 @router.post("/save", response_model=schemas.SavedPaper, status_code=status.HTTP_201_CREATED)
-def save_paper_endpoint(
+async def save_paper_endpoint(
     payload: schemas.SavePaperRequest,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    saved = save_paper(db, payload.paper, payload.tags, payload.note)
-    db.commit()
-    db.refresh(saved)
+    saved = await save_paper_async(db, payload.paper, payload.tags, payload.note)
+    await db.commit()
+    pin_primary(response)
     logger.info("paper saved", extra={"arxiv_id": payload.paper.arxiv_id})
     return saved_to_schema(saved)
 
 
 @router.get("/saved", response_model=schemas.SavedListResponse)
-def list_saved_endpoint(
+async def list_saved_endpoint(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
     keyword: Optional[str] = None,
@@ -43,9 +52,9 @@ def list_saved_endpoint(
     tag: Optional[str] = None,
     sort_by: str = Query("created_at", pattern="^(created_at|published|updated)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    items, total = list_saved(
+    items, total = await list_saved_async(
         db=db,
         page=page,
         page_size=page_size,
@@ -65,20 +74,21 @@ def list_saved_endpoint(
 
 
 @router.get("/{saved_id}", response_model=schemas.SavedPaper)
-def get_saved_endpoint(saved_id: int, db: Session = Depends(get_db)):
-    saved = get_saved_with_paper(db, saved_id)
+async def get_saved_endpoint(saved_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    saved = await get_saved_with_paper_async(db, saved_id)
     if not saved:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved paper not found")
     return saved_to_schema(saved)
 
 
 @router.patch("/{saved_id}", response_model=schemas.SavedPaper)
-def update_saved_endpoint(
+async def update_saved_endpoint(
     saved_id: int,
     payload: schemas.UpdateSavedRequest,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    saved = get_saved_with_paper(db, saved_id)
+    saved = await get_saved_with_paper_async(db, saved_id)
     if not saved:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved paper not found")
 
@@ -87,18 +97,22 @@ def update_saved_endpoint(
     if payload.note is not None:
         saved.note = payload.note
 
-    db.commit()
-    db.refresh(saved)
+    await db.commit()
+    pin_primary(response)
     return saved_to_schema(saved)
 
 
 @router.delete("/{saved_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_saved_endpoint(saved_id: int, db: Session = Depends(get_db)):
-    saved = get_saved_with_paper(db, saved_id)
+async def delete_saved_endpoint(
+    saved_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    saved = await get_saved_with_paper_async(db, saved_id)
     if not saved:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved paper not found")
 
-    delete_saved(db, saved)
-    db.commit()
+    await delete_saved_async(db, saved)
+    await db.commit()
+    pin_primary(response)
     return None
-
@@ -1,18 +1,89 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
+import math
+from typing import Any, Awaitable, List
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
 
 from .. import schemas
-from ..utils.arxiv_client import ArxivSearchParams, search_arxiv
+from ..database import SessionLocal
+from ..repositories import paper_to_schema, search_local_papers
+from ..utils.arxiv_client import ArxivSearchParams
+from ..utils.arxiv_resilience import BudgetExceeded, CircuitOpen, get_resilient_search
+from ..utils.arxiv_scheduler import DeadlineExceeded, get_scheduler
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/arxiv", tags=["arxiv"])
 
+# Non-standard "client closed request" status, only ever seen in our own logs.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def _run_until_disconnect(request: Request, coro: Awaitable[Any], poll_seconds: float = 0.25) -> Any:
+    """Await `coro`, cancelling it (and its queued upstream job) if the client goes away."""
+    task = asyncio.ensure_future(coro)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=poll_seconds)
+        if done:
+            return task.result()
+        if await request.is_disconnected():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise ClientDisconnected()
+
+
+def _local_results(params: ArxivSearchParams) -> List[schemas.ArxivPaper]:
+    db = SessionLocal()
+    try:
+        papers = search_local_papers(
+            db,
+            all_terms=params.all_terms,
+            title=params.title,
+            abstract=params.abstract,
+            author=params.author,
+            categories=params.categories,
+            id_list=params.id_list,
+            date_mode=params.date_mode,
+            date_from=params.date_from,
+            date_to=params.date_to,
+            sort_by=params.sort_by,
+            sort_order=params.sort_order,
+            limit=params.max_results,
+        )
+        return [paper_to_schema(p) for p in papers]
+    finally:
+        db.close()
+
+
+def _upstream_error(exc: Exception) -> HTTPException:
+    if isinstance(exc, CircuitOpen):
+        retry_after = get_resilient_search().breaker.snapshot()["retry_in_seconds"]
+        return HTTPException(
+            status_code=503,
+            detail="arXiv is temporarily unavailable",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+    if isinstance(exc, DeadlineExceeded):
+        return HTTPException(
+            status_code=503,
+            detail="arXiv is busy, please retry later",
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+    if isinstance(exc, BudgetExceeded):
+        return HTTPException(status_code=504, detail="arXiv did not respond in time")
+    return HTTPException(status_code=502, detail="arXiv search failed")
+
 
 @router.post("/search", response_model=schemas.SearchResponse)
-def arxiv_search(payload: schemas.SearchRequest):
+async def arxiv_search(payload: schemas.SearchRequest, request: Request):
     params = ArxivSearchParams(
         all_terms=payload.all_terms,
         title=payload.title,
@@ -28,11 +99,45 @@ def arxiv_search(payload: schemas.SearchRequest):
         id_list=payload.id_list or None,
     )
 
+    service = get_resilient_search()
     try:
-        results = search_arxiv(params)
-        logger.info("arxiv search success", extra={"params": payload.model_dump()})
+        outcome = await _run_until_disconnect(request, service.search(params))
+    except ClientDisconnected:
+        logger.info("arxiv search abandoned by client")
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except Exception as exc:  # noqa: BLE001
-        logger.exception("arxiv search failed")
-        raise HTTPException(status_code=502, detail="arXiv search failed") from exc
+        if isinstance(exc, (CircuitOpen, DeadlineExceeded, BudgetExceeded)):
+            logger.warning("arxiv search unavailable: %s", type(exc).__name__)
+        else:
+            logger.exception("arxiv search failed")
+
+        try:
+            local = await run_in_threadpool(_local_results, params)
+        except Exception:  # noqa: BLE001
+            logger.exception("local fallback search failed")
+            local = []
+        if not local:
+            raise _upstream_error(exc) from exc
+        service.record_local_serve()
+        return schemas.SearchResponse(items=local, source="local", stale=True)
+
+    logger.info(
+        "arxiv search success",
+        extra={"params": payload.model_dump(), "source": outcome.source, "stale": outcome.stale},
+    )
+    return schemas.SearchResponse(
+        items=outcome.items,
+        source=outcome.source,
+        stale=outcome.stale,
+        fetched_at=outcome.fetched_at,
+    )
+
 
-    return {"items": results}
+@router.get("/metrics")
+def arxiv_metrics():
+    service = get_resilient_search()
+    return {
+        "scheduler": get_scheduler().metrics(),
+        "breaker": service.breaker.snapshot(),
+        "cache": service.snapshot(),
+    }
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query
+
+from .. import schemas
+from ..suggestions import get_index
+
+router = APIRouter(prefix="/api", tags=["suggest"])
+
+
+@router.get("/suggest", response_model=schemas.SuggestResponse)
+async def suggest_endpoint(
+    field: schemas.SuggestField,
+    prefix: str = Query(..., min_length=1, max_length=128),
+    limit: int = Query(10, ge=1, le=50),
+):
+    # Served straight from memory (sub-millisecond), so no threadpool hop.
+    items = get_index(field).suggest(prefix, limit)
+    return schemas.SuggestResponse(
+        field=field,
+        prefix=prefix,
+        items=[schemas.Suggestion(value=value, count=count) for value, count in items],
+    )
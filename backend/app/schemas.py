@@ -52,8 +52,14 @@ class SearchRequest(BaseModel):
         return min(v, 50)
 
 
+SearchSource = Literal["arxiv", "cache", "local"]
+
+
 class SearchResponse(BaseModel):
     items: List[ArxivPaper]
+    source: SearchSource = "arxiv"
+    stale: bool = False
+    fetched_at: Optional[datetime] = None
 
 
 class SavePaperRequest(BaseModel):
@@ -86,3 +92,17 @@ class UpdateSavedRequest(BaseModel):
     tags: Optional[str] = None
     note: Optional[str] = None
 
+
+
+SuggestField = Literal["author", "category", "tag"]
+
+
+class Suggestion(BaseModel):
+    value: str
+    count: int
+
+
+class SuggestResponse(BaseModel):
+    field: SuggestField
+    prefix: str
+    items: List[Suggestion]
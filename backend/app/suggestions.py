@@ -0,0 +1,125 @@
+"""
+In-memory typeahead indexes for authors, categories and tags.
+
+Built once at startup from `papers` / `saved_papers`, then kept current from
+SQLAlchemy session events: changes are collected at flush time and applied only
+after the transaction commits, so rolled-back writes never reach the index.
+
+The events only see commits made by this process. With several workers
+(`uvicorn --workers N`, or several hosts), each worker's index misses the
+others' writes until SUGGEST_RESYNC_SECONDS triggers a rebuild from the
+database; that setting is off by default, which suits a single worker.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from .models import Paper, SavedPaper
+from .repositories import _loads_list
+from .utils.prefix_index import PrefixIndex, normalize
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("author", "category", "tag")
+
+_indexes: Dict[str, PrefixIndex] = {field: PrefixIndex() for field in FIELDS}
+
+_PENDING_KEY = "suggest_pending"
+
+
+def get_index(field: str) -> PrefixIndex:
+    return _indexes[field]
+
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    """Tags are stored as one comma-separated string, e.g. "llm, graph"."""
+    if not tags:
+        return []
+    return [t.strip() for t in tags.split(",") if t.strip()]
+
+
+def build_indexes(db: Session, batch_size: int = 10000) -> None:
+    """
+    (Re)load every index from the database.
+
+    Safe to call while serving: writes this process commits during the scan
+    keep their live counts rather than being lost to a snapshot taken before them.
+    """
+    since = {field: _indexes[field].version for field in FIELDS}
+    counts: Dict[str, Dict[str, Tuple[str, int]]] = {field: {} for field in FIELDS}
+
+    def bump(field: str, values: List[str]) -> None:
+        bucket = counts[field]
+        for value in values:
+            key = normalize(value)
+            if key:
+                display, count = bucket.get(key, (" ".join(value.split()), 0))
+                bucket[key] = (display, count + 1)
+
+    for authors, categories in db.query(Paper.authors, Paper.categories).yield_per(batch_size):
+        bump("author", _loads_list(authors))
+        bump("category", _loads_list(categories))
+
+    for (tags,) in db.query(SavedPaper.tags).yield_per(batch_size):
+        bump("tag", split_tags(tags))
+
+    for field in FIELDS:
+        _indexes[field].load(counts[field], keep_changes_since=since[field])
+    logger.info(
+        "suggest indexes built",
+        extra={field: len(_indexes[field]) for field in FIELDS},
+    )
+
+
+# ---- incremental maintenance ----
+
+
+def _values(attr: str, value) -> List[str]:
+    if attr == "tags":
+        return split_tags(value)
+    return _loads_list(value)
+
+
+_TRACKED = {
+    Paper: (("authors", "author"), ("categories", "category")),
+    SavedPaper: (("tags", "tag"),),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session: Session, flush_context, instances) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, [])
+
+    for obj in session.new:
+        for attr, field in _TRACKED.get(type(obj), ()):
+            pending.append((field, _values(attr, getattr(obj, attr)), 1))
+
+    for obj in session.dirty:
+        for attr, field in _TRACKED.get(type(obj), ()):
+            history = attributes.get_history(obj, attr)
+            for old in history.deleted:
+                pending.append((field, _values(attr, old), -1))
+            for new in history.added:
+                pending.append((field, _values(attr, new), 1))
+
+    for obj in session.deleted:
+        for attr, field in _TRACKED.get(type(obj), ()):
+            history = attributes.get_history(obj, attr)
+            current = (history.unchanged or history.deleted or [None])[0]
+            pending.append((field, _values(attr, current), -1))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    for field, values, delta in session.info.pop(_PENDING_KEY, ()):
+        if values:
+            _indexes[field].add(values, delta)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,11 +1,20 @@
 # arxiv_client.py
 from __future__ import annotations
 
+import logging
 from dataclasses import asdict, dataclass
 from datetime import date, datetime
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
-import arxiv
+from ..config import get_settings
+
+if TYPE_CHECKING:
+    # arxiv 会连带导入 feedparser/requests，放到真正调用时再导入，缩短进程冷启动。
+    import arxiv
+    import requests
+
+logger = logging.getLogger(__name__)
 
 # ---- 数据结构 ----
 
@@ -118,6 +127,8 @@ def build_search_query(params: ArxivSearchParams) -> str:
 
 
 def _to_sort_criterion(sort_by: SortBy) -> arxiv.SortCriterion:
+    import arxiv
+
     if sort_by == "submittedDate":
         return arxiv.SortCriterion.SubmittedDate
     if sort_by == "lastUpdatedDate":
@@ -126,6 +137,8 @@ def _to_sort_criterion(sort_by: SortBy) -> arxiv.SortCriterion:
 
 
 def _to_sort_order(order: SortOrder) -> arxiv.SortOrder:
+    import arxiv
+
     return (
         arxiv.SortOrder.Ascending
         if order == "ascending"
@@ -175,6 +188,55 @@ def _parse_result(result: arxiv.Result) -> ArxivPaper:
 
 # ---- 对外主函数 ----
 
+ARXIV_HOST_URL = "https://export.arxiv.org/"
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> "requests.Session":
+    """
+    进程内共享的 requests.Session：所有 arxiv.Client 共用同一个连接池 / keep-alive。
+    """
+    import requests
+
+    return requests.Session()
+
+
+@lru_cache(maxsize=None)
+def get_client(page_size: int) -> arxiv.Client:
+    """
+    按 page_size 缓存的 arxiv.Client（最多 50 个），底层共用 get_http_session()。
+    - arxiv.Client 会把 page_size 作为上游的 max_results，所以必须按本次请求的条数传入，
+      否则每次 20 条的搜索也会下载 arxiv_page_size 条
+    - 3 秒礼貌间隔由 arxiv_scheduler 在所有请求间统一保证，这里的 delay_seconds 只作用于单个 client
+    """
+    import arxiv
+
+    settings = get_settings()
+    client = arxiv.Client(
+        page_size=page_size,
+        delay_seconds=settings.arxiv_delay_seconds,
+        num_retries=settings.arxiv_num_retries,
+    )
+    # arxiv 2.x 没有公开注入 Session 的参数，只能替换私有属性。
+    client._session = get_http_session()
+    return client
+
+
+def warm_up_connection(timeout: float = 5.0) -> bool:
+    """
+    提前完成 DNS 解析和 TCP/TLS 握手，并把连接留在共享 Session 的连接池里。
+    只请求站点首页，不算一次 API 查询；失败只记日志，不影响启动。
+    """
+    import requests
+
+    try:
+        get_http_session().head(ARXIV_HOST_URL, timeout=timeout)
+    except requests.RequestException as exc:
+        logger.warning("arxiv connection warm-up failed: %s", exc)
+        return False
+    return True
+
+
 def search_arxiv(
     params: ArxivSearchParams,
     client: Optional[arxiv.Client] = None,
@@ -182,17 +244,15 @@ def search_arxiv(
     """
     安全调用 arxiv API，返回 dict 列表。
     - 自动限制 max_results <= 50
-    - 默认使用 arxiv.Client(page_size=50, delay_seconds=3, num_retries=3)
+    - 默认使用 get_client(min(max_results, arxiv_page_size))，共享同一个 HTTP Session
     - 支持 search_query / id_list 两种模式
     """
+    import arxiv
+
     max_results = min(params.max_results, 50)
 
     if client is None:
-        client = arxiv.Client(
-            page_size=max_results,  # 一页拿完
-            delay_seconds=3,        # 官方建议：至少 3 秒一请求
-            num_retries=3,          # 简单自动重试
-        )
+        client = get_client(max(1, min(max_results, get_settings().arxiv_page_size)))
 
     if params.id_list:
         # 按 id_list 查询，用于详情或精确命中
@@ -0,0 +1,285 @@
+"""
+Latency-bounded arXiv search: stale-while-revalidate cache + circuit breaker.
+
+- A query answered before is served from the cache right away. Past
+  `fresh_seconds` the entry is returned flagged as stale and refreshed in the
+  background at batch priority.
+- A query never seen before waits at most `budget_seconds` for arXiv. That is
+  also the scheduler deadline of its upstream job, so a job that cannot start
+  in time is shed; one that already started keeps running afterwards so its
+  result still lands in the cache.
+- After `failure_threshold` consecutive upstream failures the breaker opens and
+  uncached queries fail fast with CircuitOpen until a probe succeeds.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+from .arxiv_client import ArxivSearchParams, search_arxiv
+from .arxiv_scheduler import DeadlineExceeded, Priority, get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """arXiv has been failing; the breaker rejects calls until it recovers."""
+
+
+class BudgetExceeded(Exception):
+    """arXiv did not answer within the search time budget."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        self._trips = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            # Let exactly one probe through; its outcome closes or re-opens the breaker.
+            self._probe_in_flight = True
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info("arxiv circuit breaker closed")
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        probe_failed = self._probe_in_flight
+        self._probe_in_flight = False
+        if probe_failed or (
+            self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold
+        ):
+            self._trips += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            logger.warning(
+                "arxiv circuit breaker opened",
+                extra={"consecutive_failures": self._consecutive_failures},
+            )
+
+    def release(self) -> None:
+        """The call ended without a verdict (shed or cancelled); free the probe slot."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        retry_in = 0.0
+        if state == self.OPEN:
+            retry_in = self.reset_seconds - (time.monotonic() - self._opened_at)
+        return {
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "trips": self._trips,
+            "rejected": self._rejected,
+            "retry_in_seconds": round(max(retry_in, 0.0), 3),
+        }
+
+
+@dataclass
+class _CacheEntry:
+    items: List[Dict[str, Any]]
+    fetched_at: datetime
+    stored_at: float  # monotonic
+
+
+@dataclass
+class SearchOutcome:
+    items: List[Dict[str, Any]]
+    source: str  # "arxiv" | "cache"
+    stale: bool
+    fetched_at: Optional[datetime]
+
+
+_BOOLEAN_OPERATORS = frozenset({"AND", "OR", "ANDNOT"})
+
+
+def cache_key(params: ArxivSearchParams) -> str:
+    """Key equivalent queries (case, whitespace, category/id order) to the same entry."""
+
+    def norm(value: Optional[str]) -> Optional[str]:
+        # arXiv terms are case-insensitive but its boolean operators are not:
+        # "a AND b" and "a and b" are different upstream queries.
+        if not value:
+            return None
+        return " ".join(t if t in _BOOLEAN_OPERATORS else t.lower() for t in value.split())
+
+    data = {
+        "all_terms": norm(params.all_terms),
+        "title": norm(params.title),
+        "abstract": norm(params.abstract),
+        "author": norm(params.author),
+        "categories": sorted({c.strip() for c in params.categories or [] if c.strip()}),
+        "date_mode": params.date_mode if (params.date_from or params.date_to) else None,
+        "date_from": params.date_from,
+        "date_to": params.date_to,
+        "start": params.start,
+        "max_results": min(params.max_results, 50),
+        "sort_by": params.sort_by,
+        "sort_order": params.sort_order,
+        "id_list": sorted(params.id_list or []),
+    }
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+class ResilientArxivSearch:
+    def __init__(
+        self,
+        budget_seconds: float = 8.0,
+        fresh_seconds: float = 60.0,
+        max_entries: int = 512,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.budget_seconds = budget_seconds
+        self.fresh_seconds = fresh_seconds
+        self.max_entries = max_entries
+        self.breaker = breaker or CircuitBreaker()
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.stats = {
+            "fresh_hits": 0,
+            "stale_served": 0,
+            "local_served": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "budget_exceeded": 0,
+        }
+
+    async def search(self, params: ArxivSearchParams) -> SearchOutcome:
+        key = cache_key(params)
+        entry = self._cache.get(key)
+
+        if entry is not None:
+            self._cache.move_to_end(key)
+            if time.monotonic() - entry.stored_at < self.fresh_seconds:
+                self.stats["fresh_hits"] += 1
+                return SearchOutcome(entry.items, "cache", False, entry.fetched_at)
+
+            self.stats["stale_served"] += 1
+            if key not in self._inflight and self.breaker.allow_request():
+                self.stats["refreshes"] += 1
+                self._start_fetch(key, params, Priority.BATCH)
+            return SearchOutcome(entry.items, "cache", True, entry.fetched_at)
+
+        if key not in self._inflight and not self.breaker.allow_request():
+            raise CircuitOpen()
+
+        task = self._start_fetch(key, params, Priority.INTERACTIVE)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            items = await asyncio.wait_for(asyncio.shield(task), self.budget_seconds)
+        except asyncio.TimeoutError as exc:
+            # Keep the upstream call running: its result warms the cache.
+            self.stats["budget_exceeded"] += 1
+            raise BudgetExceeded() from exc
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+        stored = self._cache.get(key)
+        return SearchOutcome(items, "arxiv", False, stored.fetched_at if stored else None)
+
+    def record_local_serve(self) -> None:
+        """The caller answered from the local papers table instead of arXiv."""
+        self.stats["local_served"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"entries": len(self._cache), "inflight": len(self._inflight), **self.stats}
+
+    # ---- internals ----
+
+    def _start_fetch(self, key: str, params: ArxivSearchParams, priority: Priority) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, params, priority))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetch_done(key, t, priority))
+        return task
+
+    def _fetch_done(self, key: str, task: asyncio.Task, priority: Priority) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        exc = task.exception()  # always retrieve, background refreshes have no awaiter
+        if exc is not None and priority == Priority.BATCH:
+            self.stats["refresh_failures"] += 1
+            logger.warning("arxiv background refresh failed", exc_info=exc)
+
+    async def _fetch(self, key: str, params: ArxivSearchParams, priority: Priority) -> List[Dict[str, Any]]:
+        try:
+            # An interactive caller stops waiting after budget_seconds; a job that
+            # cannot start in time is shed rather than holding an interactive slot
+            # for a client that already got its 504.
+            timeout = self.budget_seconds if priority == Priority.INTERACTIVE else None
+            items = await get_scheduler().run(lambda: search_arxiv(params), priority=priority, timeout=timeout)
+        except (DeadlineExceeded, asyncio.CancelledError):
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        self._store(key, items)
+        return items
+
+    def _store(self, key: str, items: List[Dict[str, Any]]) -> None:
+        self._cache[key] = _CacheEntry(items, datetime.now(timezone.utc), time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def get_resilient_search() -> ResilientArxivSearch:
+    settings = get_settings()
+    return ResilientArxivSearch(
+        budget_seconds=settings.arxiv_search_budget_seconds,
+        fresh_seconds=settings.arxiv_cache_fresh_seconds,
+        max_entries=settings.arxiv_cache_max_entries,
+        breaker=CircuitBreaker(
+            failure_threshold=settings.arxiv_breaker_failure_threshold,
+            reset_seconds=settings.arxiv_breaker_reset_seconds,
+        ),
+    )
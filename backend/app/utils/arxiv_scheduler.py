@@ -0,0 +1,248 @@
+"""
+Priority scheduler for upstream arXiv calls.
+
+All calls to arXiv share one politeness budget (one request every
+`arxiv_delay_seconds`), so they go through a single queue:
+
+- interactive work (user searches) is always dequeued before batch work
+  (harvests, refreshes, ID resolution);
+- every job has a deadline; a job that can no longer finish before it is shed
+  with DeadlineExceeded, either on submit or when it is dequeued;
+- a job whose caller is cancelled (e.g. the HTTP client disconnected) while
+  it is still queued never reaches arXiv.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class DeadlineExceeded(Exception):
+    """The job could not be started early enough to finish before its deadline."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("upstream deadline cannot be met")
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    deadline: float = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    fn: Callable[[], Any] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    started: bool = field(default=False, compare=False)
+
+
+class UpstreamScheduler:
+    def __init__(
+        self,
+        concurrency: int = 1,
+        min_interval: float = 3.0,
+        initial_service_estimate: float = 2.0,
+        wait_samples: int = 1000,
+    ) -> None:
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._heap: List[_Job] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = 0
+        # Earliest monotonic time the next upstream request may start.
+        self._next_slot = 0.0
+        # EWMA of upstream service time, excluding the politeness wait.
+        self._service_estimate = initial_service_estimate
+
+        self._waits: Deque[float] = deque(maxlen=wait_samples)
+        self._completed = 0
+        self._failed = 0
+        self._shed = 0
+        self._cancelled = 0
+
+    # ---- public API ----
+
+    async def run(
+        self,
+        fn: Callable[[], Any],
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Queue `fn` (a blocking callable, run in a worker thread) and return its result.
+
+        Raises DeadlineExceeded if it cannot finish within `timeout` seconds.
+        Cancelling the awaiting task drops the job if it has not started yet.
+        """
+        self._ensure_workers()
+        now = time.monotonic()
+        deadline = now + (timeout if timeout is not None else _default_timeout(priority))
+
+        expected_finish = self._expected_start(now, priority) + self._service_estimate
+        if expected_finish > deadline:
+            self._shed += 1
+            raise DeadlineExceeded(retry_after=expected_finish - now)
+
+        job = _Job(
+            priority=int(priority),
+            seq=next(self._seq),
+            deadline=deadline,
+            enqueued_at=now,
+            fn=fn,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._heap, job)
+        self._wakeup.set()
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # Awaiting the future from a cancelled task cancels the future too,
+            # which is what makes the worker skip the job if it is still queued.
+            if not job.started:
+                self._cancelled += 1
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        depth = {p.name.lower(): 0 for p in Priority}
+        for job in self._heap:
+            if not job.future.done():
+                depth[Priority(job.priority).name.lower()] += 1
+
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": depth,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "shed": self._shed,
+            "cancelled": self._cancelled,
+            "service_estimate_seconds": round(self._service_estimate, 3),
+            "wait_seconds": {
+                "samples": len(waits),
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p50": round(_percentile(waits, 0.50), 3),
+                "p95": round(_percentile(waits, 0.95), 3),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+        self._loop = None
+        while self._heap:
+            job = heapq.heappop(self._heap)
+            if not job.future.done():
+                job.future.cancel()
+
+    # ---- internals ----
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._workers and self._loop is loop:
+            return
+        # First use, or the previous event loop is gone (e.g. a new test client).
+        self._loop = loop
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"arxiv-scheduler-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    def _expected_start(self, now: float, priority: Priority) -> float:
+        ahead = sum(
+            1 for job in self._heap if job.priority <= priority and not job.future.done()
+        )
+        ahead += self._running
+        per_job = max(self._service_estimate, self.min_interval)
+        return max(now, self._next_slot) + ahead * per_job / self.concurrency
+
+    async def _worker(self) -> None:
+        while True:
+            while not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Wait for the politeness slot *before* picking a job, so interactive
+            # work that arrives meanwhile still goes ahead of queued batch work.
+            now = time.monotonic()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+                continue
+
+            job = heapq.heappop(self._heap)
+            if job.future.done():  # cancelled while queued
+                continue
+
+            if now + self._service_estimate > job.deadline:
+                self._shed += 1
+                job.future.set_exception(DeadlineExceeded(retry_after=self.min_interval))
+                continue
+
+            job.started = True
+            self._next_slot = now + self.min_interval
+            self._waits.append(now - job.enqueued_at)
+
+            self._running += 1
+            try:
+                result = await asyncio.to_thread(job.fn)
+            except Exception as exc:  # noqa: BLE001
+                self._failed += 1
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            else:
+                self._completed += 1
+                elapsed = time.monotonic() - now
+                self._service_estimate = 0.8 * self._service_estimate + 0.2 * elapsed
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._running -= 1
+                self._next_slot = max(self._next_slot, time.monotonic() + self.min_interval)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def _default_timeout(priority: Priority) -> float:
+    settings = get_settings()
+    if priority == Priority.INTERACTIVE:
+        return settings.arxiv_interactive_timeout_seconds
+    return settings.arxiv_batch_timeout_seconds
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> UpstreamScheduler:
+    settings = get_settings()
+    return UpstreamScheduler(
+        concurrency=settings.arxiv_max_concurrency,
+        min_interval=settings.arxiv_delay_seconds,
+    )
@@ -0,0 +1,242 @@
+"""
+Frequency-ranked prefix index over a large set of short strings.
+
+Layout: a compacted *base* of parallel sorted arrays plus a small *delta* of
+keys whose counts changed since the base was built.
+
+- `keys` (normalized, sorted) is searched with bisect, so a prefix maps to a
+  contiguous slice [lo, hi).
+- Slices of at most `small_range` keys are ranked directly with heapq.nlargest.
+- Every prefix with a wider slice (all short prefixes, plus long shared ones
+  like "zhan") gets its top `top_k` positions precomputed when the base is
+  built, so no query ever scans more than `small_range` entries, whatever the
+  count distribution. Most authors appear exactly once, and those ties give a
+  count-ordered scan nothing to stop early on.
+- Writes only touch the entry map and the delta. Once the delta grows past
+  `compact_threshold` the base is rebuilt on a background thread, and queries
+  keep using the old base plus delta meanwhile.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _sort_yielding(items: List[Tuple[str, str, int]], run: int = 16384) -> List[Tuple[str, str, int]]:
+    """
+    Sort `items` without holding the GIL for the whole sort.
+
+    A single list.sort() of a million tuples is one C call that blocks every
+    other thread, the event loop included, for seconds. Short sorted runs merged
+    by heapq.merge (a Python generator) give the interpreter a chance to switch
+    threads every few milliseconds.
+    """
+    if len(items) <= run:
+        return sorted(items)
+    runs = [sorted(items[i : i + run]) for i in range(0, len(items), run)]
+    return list(heapq.merge(*runs))
+
+
+class _Base:
+    __slots__ = ("keys", "displays", "counts", "top")
+
+    def __init__(self, items: List[Tuple[str, str, int]], small_range: int, top_k: int) -> None:
+        items = _sort_yielding(items)
+        self.keys = [k for k, _, _ in items]
+        self.displays = [d for _, d, _ in items]
+        self.counts = [c for _, _, c in items]
+        # Wide prefix -> base positions of its `top_k` most frequent keys.
+        self.top: Dict[str, List[int]] = {}
+        if len(self.keys) > small_range:
+            self._rank_wide("", 0, len(self.keys), small_range, top_k)
+
+    def _rank_wide(self, prefix: str, lo: int, hi: int, small_range: int, top_k: int) -> None:
+        """Precompute `prefix` (slice [lo, hi) is wider than small_range) and its wide children."""
+        keys = self.keys
+        self.top[prefix] = heapq.nlargest(top_k, range(lo, hi), key=self.counts.__getitem__)
+        depth = len(prefix)
+        pos = lo
+        while pos < hi:
+            if len(keys[pos]) == depth:  # the prefix itself, sorts first
+                pos += 1
+                continue
+            child = keys[pos][: depth + 1]
+            end = bisect.bisect_left(keys, child + "\U0010ffff", pos, hi)
+            if end - pos > small_range:
+                self._rank_wide(child, pos, end, small_range, top_k)
+            pos = end
+
+
+class PrefixIndex:
+    def __init__(self, small_range: int = 512, top_k: int = 100, compact_threshold: int = 1024) -> None:
+        self.small_range = small_range
+        # Queries skip base entries that are in the delta, so keep headroom over
+        # the largest `limit` the API allows (50).
+        self.top_k = top_k
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        # Source of truth: normalized key -> count / display form. Plain str->int
+        # and str->str dicts are not tracked by the cyclic GC; the base's lists
+        # are, so full collections still walk them (a few ms per million keys).
+        self._counts: Dict[str, int] = {}
+        self._displays: Dict[str, str] = {}
+        self._base = self._build([])
+        # Keys changed since the base snapshot -> version of their last change.
+        self._delta: Dict[str, int] = {}
+        self._delta_sorted: List[str] = []
+        self._version = 0
+        # Bumped by load(); a compaction started before a load must not install its base.
+        self._generation = 0
+        self._compacting = False
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    @property
+    def version(self) -> int:
+        """Increases with every write; pass it to load() to keep writes made after it."""
+        return self._version
+
+    # ---- writes ----
+
+    def load(self, counts: Dict[str, Tuple[str, int]], keep_changes_since: Optional[int] = None) -> None:
+        """
+        Replace the whole index; `counts` maps normalized key -> (display, count).
+
+        With `keep_changes_since`, keys written after that version (i.e. while
+        `counts` was being read) keep their current count instead.
+        """
+        items = [(k, d, c) for k, (d, c) in counts.items() if c > 0]
+        base = self._build(items)
+        # Comprehensions rather than dict(zip(...)), which is one GIL-holding C call.
+        new_counts = {k: c for k, c in zip(base.keys, base.counts)}
+        new_displays = {k: d for k, d in zip(base.keys, base.displays)}
+        # Only the swap and the (small) delta merge happen under the lock: suggest()
+        # and add() run on the event loop and must never wait for a rebuild.
+        with self._lock:
+            delta: Dict[str, int] = {}
+            if keep_changes_since is not None:
+                for key, version in self._delta.items():
+                    if version <= keep_changes_since:
+                        continue
+                    delta[key] = version
+                    if key in self._counts:
+                        new_counts[key] = self._counts[key]
+                        new_displays[key] = self._displays[key]
+                    else:
+                        new_counts.pop(key, None)
+                        new_displays.pop(key, None)
+            # Keep the old structures alive until the lock is released; freeing
+            # a million entries is itself a noticeable pause.
+            retired = (self._counts, self._displays, self._base)
+            self._counts = new_counts
+            self._displays = new_displays
+            self._base = base
+            self._delta = delta
+            self._delta_sorted = sorted(delta)
+            self._generation += 1
+        del retired
+
+    def add(self, values: Iterable[str], delta: int = 1) -> None:
+        with self._lock:
+            for value in values:
+                key = normalize(value)
+                if not key:
+                    continue
+                count = self._counts.get(key, 0) + delta
+                if count > 0:
+                    self._counts[key] = count
+                    self._displays.setdefault(key, " ".join(value.split()))
+                elif key in self._counts:
+                    del self._counts[key]
+                    del self._displays[key]
+                else:
+                    continue
+                self._version += 1
+                if key not in self._delta:
+                    bisect.insort(self._delta_sorted, key)
+                self._delta[key] = self._version
+            needs_compaction = len(self._delta) > self.compact_threshold and not self._compacting
+            if needs_compaction:
+                self._compacting = True
+        if needs_compaction:
+            threading.Thread(target=self._compact, name="prefix-index-compact", daemon=True).start()
+
+    def remove(self, values: Iterable[str]) -> None:
+        self.add(values, delta=-1)
+
+    # ---- reads ----
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return up to `limit` (display, count) pairs starting with `prefix`, most frequent first."""
+        key = normalize(prefix)
+        with self._lock:
+            base, delta = self._base, self._delta
+            lo = bisect.bisect_left(base.keys, key)
+            hi = bisect.bisect_left(base.keys, key + "\U0010ffff", lo)
+
+            # Current counts for changed keys come from the delta, not the base.
+            hits: List[Tuple[int, str]] = []
+            changed = 0
+            delta_keys = self._delta_sorted
+            for i in range(bisect.bisect_left(delta_keys, key), len(delta_keys)):
+                k = delta_keys[i]
+                if not k.startswith(key):
+                    break
+                changed += 1
+                count = self._counts.get(k)
+                if count is not None:
+                    hits.append((count, self._displays[k]))
+
+            # Base entries for changed keys are skipped, so rank `limit + changed`.
+            want = limit + changed
+            ranked = base.top.get(key) if hi - lo > self.small_range else None
+            if ranked is not None and delta and sum(base.keys[p] in delta for p in ranked) > len(ranked) - limit:
+                # Too many of this prefix's top entries changed since the base was
+                # built; rank the slice directly until the next compaction.
+                ranked = None
+            if ranked is None:
+                ranked = heapq.nlargest(want, range(lo, hi), key=base.counts.__getitem__)
+
+            found = 0
+            for pos in ranked:
+                if base.keys[pos] not in delta:
+                    hits.append((base.counts[pos], base.displays[pos]))
+                    found += 1
+                    if found >= limit:
+                        break
+
+        hits.sort(key=lambda h: (-h[0], h[1]))
+        return [(display, count) for count, display in hits[:limit]]
+
+    # ---- internals ----
+
+    def _build(self, items: List[Tuple[str, str, int]]) -> _Base:
+        return _Base(items, self.small_range, self.top_k)
+
+    def _compact(self) -> None:
+        # A base is never mutated once built, and keys outside the delta still have
+        # their base counts, so the new base is the old one with the delta applied.
+        # Only the delta (at most ~compact_threshold keys) is copied under the lock.
+        with self._lock:
+            version, generation, old = self._version, self._generation, self._base
+            changed = {k: (self._displays.get(k), self._counts.get(k)) for k in self._delta}
+        items = [
+            (k, d, c)
+            for k, d, c in zip(old.keys, old.displays, old.counts)
+            if k not in changed
+        ]
+        items.extend((k, d, c) for k, (d, c) in changed.items() if c is not None)
+        base = self._build(items)
+        with self._lock:
+            if generation == self._generation:
+                base, self._base = self._base, base  # old base is freed outside the lock
+                self._delta = {k: v for k, v in self._delta.items() if v > version}
+                self._delta_sorted = sorted(self._delta)
+            self._compacting = False
@@ -0,0 +1,77 @@
+"""
+Concurrency benchmark for GET /api/papers/saved (sync vs async DB path).
+
+Start the server yourself, once per mode, then point this script at it:
+
+    DB_ASYNC=false uvicorn app.main:app --port 8179   # sync (threadpool) path
+    DB_ASYNC=true  uvicorn app.main:app --port 8179   # async path
+    python scripts/bench_papers_concurrency.py --url http://127.0.0.1:8179
+
+Each concurrency level runs `--requests` requests through that many concurrent
+clients and prints requests/sec and p50/p99 latency.
+
+Needs httpx, which the server itself does not use; it is listed in
+requirements-dev.txt (`pip install -r requirements-dev.txt`).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+async def _run_level(url: str, concurrency: int, total: int) -> None:
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get("/api/papers/saved", params={"page_size": 10})
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+                if resp.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"concurrency={concurrency:<4} all {errors} requests failed")
+        return
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"concurrency={concurrency:<4} rps={len(latencies) / elapsed:8.1f} "
+        f"p50={statistics.median(latencies) * 1000:7.1f}ms p99={p99 * 1000:7.1f}ms errors={errors}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8179")
+    parser.add_argument("--levels", default="50,100,200,500")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for level in (int(v) for v in args.levels.split(",")):
+        await _run_level(args.url, level, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import search as search_router
+from app.utils import arxiv_resilience
+from app.utils.arxiv_client import ArxivSearchParams
+from app.utils.arxiv_resilience import (
+    BudgetExceeded,
+    CircuitBreaker,
+    CircuitOpen,
+    ResilientArxivSearch,
+    cache_key,
+)
+from app.utils.arxiv_scheduler import DeadlineExceeded, UpstreamScheduler
+
+
+class FakeArxiv:
+    def __init__(self):
+        self.mode = "ok"
+        self.calls = 0
+
+    def __call__(self, params):
+        self.calls += 1
+        if self.mode == "fail":
+            raise RuntimeError("arxiv down")
+        if self.mode == "slow":
+            time.sleep(0.3)
+        return [{"arxiv_id": params.title, "title": params.title}]
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeArxiv()
+    scheduler = UpstreamScheduler(concurrency=1, min_interval=0.0, initial_service_estimate=0.01)
+    monkeypatch.setattr(arxiv_resilience, "search_arxiv", fake)
+    monkeypatch.setattr(arxiv_resilience, "get_scheduler", lambda: scheduler)
+    return fake
+
+
+# ---- circuit breaker ----
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["trips"] == 1
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_breaker_lets_exactly_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()  # failed probe re-opens immediately
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_released_probe_frees_the_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+
+
+# ---- cached search ----
+
+
+def test_cache_key_ignores_case_whitespace_and_order():
+    a = ArxivSearchParams(title="  Graph   Networks ", categories=["cs.LG", "cs.AI"])
+    b = ArxivSearchParams(title="graph networks", categories=["cs.AI", "cs.LG"])
+    assert cache_key(a) == cache_key(b)
+    assert cache_key(a) != cache_key(ArxivSearchParams(title="graph networks"))
+
+
+def test_cache_key_keeps_the_case_of_boolean_operators():
+    upper = ArxivSearchParams(all_terms="Graph AND networks")
+    assert cache_key(upper) == cache_key(ArxivSearchParams(all_terms="graph  AND Networks"))
+    assert cache_key(upper) != cache_key(ArxivSearchParams(all_terms="graph and networks"))
+    assert cache_key(ArxivSearchParams(title="a OR b")) != cache_key(ArxivSearchParams(title="a or b"))
+
+
+def test_stale_entry_is_served_while_arxiv_fails(upstream):
+    service = ResilientArxivSearch(budget_seconds=1, fresh_seconds=0, breaker=CircuitBreaker(3, 30))
+
+    async def scenario():
+        first = await service.search(ArxivSearchParams(title="q1"))
+        upstream.mode = "fail"
+        second = await service.search(ArxivSearchParams(title=" Q1 "))
+        await asyncio.gather(*service._inflight.values(), return_exceptions=True)  # the refresh
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert (first.source, first.stale) == ("arxiv", False)
+    assert (second.source, second.stale) == ("cache", True)
+    assert second.items == first.items
+    assert service.stats["stale_served"] == 1
+    assert service.stats["refresh_failures"] == 1
+
+
+def test_open_breaker_fails_uncached_queries_fast(upstream):
+    upstream.mode = "fail"
+    service = ResilientArxivSearch(budget_seconds=1, breaker=CircuitBreaker(2, 30))
+
+    async def scenario():
+        for title in ("a", "b"):
+            with pytest.raises(RuntimeError):
+                await service.search(ArxivSearchParams(title=title))
+        with pytest.raises(CircuitOpen):
+            await service.search(ArxivSearchParams(title="c"))
+
+    asyncio.run(scenario())
+    assert upstream.calls == 2
+    assert service.breaker.state == CircuitBreaker.OPEN
+
+
+def test_budget_exceeded_result_still_lands_in_cache(upstream):
+    upstream.mode = "slow"
+    service = ResilientArxivSearch(budget_seconds=0.05, fresh_seconds=60)
+
+    async def scenario():
+        with pytest.raises(BudgetExceeded):
+            await service.search(ArxivSearchParams(title="slow"))
+        await asyncio.sleep(0.4)
+        return await service.search(ArxivSearchParams(title="slow"))
+
+    outcome = asyncio.run(scenario())
+    assert (outcome.source, outcome.stale) == ("cache", False)
+    assert upstream.calls == 1
+    assert service.stats["budget_exceeded"] == 1
+
+
+def test_interactive_jobs_past_the_budget_are_shed(upstream, monkeypatch):
+    upstream.mode = "slow"
+    scheduler = UpstreamScheduler(concurrency=1, min_interval=0.3, initial_service_estimate=0.3)
+    monkeypatch.setattr(arxiv_resilience, "get_scheduler", lambda: scheduler)
+    service = ResilientArxivSearch(budget_seconds=1.0, breaker=CircuitBreaker(100, 30))
+
+    async def scenario():
+        searches = [service.search(ArxivSearchParams(title=f"q{i}")) for i in range(10)]
+        outcomes = await asyncio.gather(*searches, return_exceptions=True)
+        await asyncio.sleep(1.5)  # anything still queued would have run by now
+        await scheduler.stop()
+        return outcomes
+
+    outcomes = asyncio.run(scenario())
+    answered = [o for o in outcomes if not isinstance(o, Exception)]
+    rejected = [o for o in outcomes if isinstance(o, (DeadlineExceeded, BudgetExceeded))]
+    assert answered and len(answered) + len(rejected) == 10
+    # Only the jobs that could start within the budget ever reached arXiv.
+    assert upstream.calls < 10
+    assert scheduler.metrics()["shed"] == 10 - upstream.calls
+
+
+# ---- router fallback ----
+
+
+class DownService(ResilientArxivSearch):
+    async def search(self, params):
+        raise CircuitOpen()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    service = DownService(breaker=CircuitBreaker(1, 30))
+    service.breaker.record_failure()
+    monkeypatch.setattr(search_router, "get_resilient_search", lambda: service)
+    app = FastAPI()
+    app.include_router(search_router.router)
+    return TestClient(app), service
+
+
+def test_local_results_are_served_when_arxiv_is_down(client, monkeypatch):
+    test_client, service = client
+    monkeypatch.setattr(search_router, "_local_results", lambda params: [{"arxiv_id": "L1", "title": "local"}])
+    response = test_client.post("/api/arxiv/search", json={"title": "local"})
+    assert response.status_code == 200
+    assert (response.json()["source"], response.json()["stale"]) == ("local", True)
+    assert service.snapshot()["local_served"] == 1
+
+
+def test_failing_local_fallback_keeps_the_upstream_status(client, monkeypatch):
+    test_client, service = client
+
+    def broken(params):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(search_router, "_local_results", broken)
+    response = test_client.post("/api/arxiv/search", json={"title": "anything"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert service.snapshot()["local_served"] == 0
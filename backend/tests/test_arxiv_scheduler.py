@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.arxiv_scheduler import DeadlineExceeded, Priority, UpstreamScheduler
+
+
+def _job(name, order, seconds=0.05):
+    def fn():
+        time.sleep(seconds)
+        order.append(name)
+        return name
+
+    return fn
+
+
+def test_interactive_jobs_overtake_queued_batch_jobs():
+    async def scenario():
+        scheduler = UpstreamScheduler(concurrency=1, min_interval=0.1, initial_service_estimate=0.05)
+        order = []
+        batch = [
+            asyncio.create_task(scheduler.run(_job(f"b{i}", order), Priority.BATCH, timeout=30))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.02)  # b0 is running, b1 and b2 are queued
+        interactive = asyncio.create_task(scheduler.run(_job("i0", order), Priority.INTERACTIVE, timeout=30))
+        results = await asyncio.gather(*batch, interactive)
+        await scheduler.stop()
+        return order, results, scheduler.metrics()
+
+    order, results, metrics = asyncio.run(scenario())
+    assert order == ["b0", "i0", "b1", "b2"]
+    assert results == ["b0", "b1", "b2", "i0"]
+    assert metrics["completed"] == 4
+    assert metrics["wait_seconds"]["samples"] == 4
+
+
+def test_job_that_cannot_meet_its_deadline_is_shed_on_submit():
+    async def scenario():
+        scheduler = UpstreamScheduler(concurrency=1, min_interval=0.1, initial_service_estimate=0.05)
+        order = []
+        running = asyncio.create_task(scheduler.run(_job("slow", order, 0.2), timeout=30))
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceeded) as info:
+            await scheduler.run(_job("tight", order), timeout=0.05)
+        await running
+        await scheduler.stop()
+        return order, info.value, scheduler.metrics()
+
+    order, exc, metrics = asyncio.run(scenario())
+    assert order == ["slow"]
+    assert exc.retry_after > 0.05
+    assert metrics["shed"] == 1
+
+
+def test_cancelled_queued_job_never_runs():
+    async def scenario():
+        scheduler = UpstreamScheduler(concurrency=1, min_interval=0.1, initial_service_estimate=0.05)
+        order = []
+        first = asyncio.create_task(scheduler.run(_job("first", order), timeout=30))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(scheduler.run(_job("abandoned", order), timeout=30))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await first
+        await asyncio.sleep(0.2)  # past the next politeness slot
+        await scheduler.stop()
+        return order, queued, scheduler.metrics()
+
+    order, queued, metrics = asyncio.run(scenario())
+    assert queued.cancelled()
+    assert order == ["first"]
+    assert metrics["cancelled"] == 1
+    assert metrics["queue_depth"] == {"interactive": 0, "batch": 0}
+
+
+def test_failures_propagate_to_the_caller():
+    def boom():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        scheduler = UpstreamScheduler(concurrency=1, min_interval=0.0)
+        with pytest.raises(RuntimeError):
+            await scheduler.run(boom, timeout=30)
+        await scheduler.stop()
+        return scheduler.metrics()
+
+    assert asyncio.run(scenario())["failed"] == 1
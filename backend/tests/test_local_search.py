@@ -0,0 +1,64 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Paper
+from app.repositories import search_local_papers
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rows = [
+        ("1", "Graph neural networks", "message passing", "2020-03-01", "2021-01-01"),
+        ("2", "Neural graph search", "graphs", "2021-06-15", "2021-06-15"),
+        ("3", "Convolutional networks", "images", "2022-01-10", "2023-05-01"),
+    ]
+    for arxiv_id, title, summary, published, updated in rows:
+        session.add(
+            Paper(
+                arxiv_id=arxiv_id,
+                title=title,
+                summary=summary,
+                authors='["Ada Lovelace"]',
+                categories='["cs.LG"]',
+                published=datetime.fromisoformat(published),
+                updated=datetime.fromisoformat(updated),
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _ids(papers):
+    return [p.arxiv_id for p in papers]
+
+
+def test_all_terms_must_each_match(db):
+    assert _ids(search_local_papers(db, all_terms="graph networks")) == ["1"]
+    assert _ids(search_local_papers(db, all_terms="networks AND graph")) == ["1"]
+    assert _ids(search_local_papers(db, all_terms='"neural graph"')) == ["2"]
+
+
+def test_boolean_operators_it_cannot_express_return_nothing(db):
+    assert search_local_papers(db, all_terms="graph OR images") == []
+    assert search_local_papers(db, title="networks ANDNOT graph") == []
+
+
+def test_date_range_is_inclusive_and_follows_date_mode(db):
+    submitted = search_local_papers(db, date_mode="submitted", date_from=date(2021, 6, 15), date_to=date(2022, 1, 10))
+    assert _ids(submitted) == ["3", "2"]
+    updated = search_local_papers(db, date_mode="updated", date_from=date(2021, 1, 1), date_to=date(2021, 1, 1))
+    assert _ids(updated) == ["1"]
+
+
+def test_requested_sort_is_applied(db):
+    assert _ids(search_local_papers(db, sort_by="submittedDate", sort_order="ascending")) == ["1", "2", "3"]
+    assert _ids(search_local_papers(db, sort_by="lastUpdatedDate", sort_order="descending")) == ["3", "2", "1"]
+    assert _ids(search_local_papers(db, sort_by="relevance", sort_order="ascending")) == ["3", "2", "1"]
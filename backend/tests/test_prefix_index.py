@@ -0,0 +1,96 @@
+import random
+import string
+
+import pytest
+
+from app.utils.prefix_index import PrefixIndex, normalize
+
+
+def _random_names(rng, n, share_one):
+    names = {}
+    while len(names) < n:
+        name = "".join(rng.choices("abcz", k=rng.randint(1, 6))).title()
+        count = 1 if rng.random() < share_one else rng.randint(2, 40)
+        names[normalize(name)] = (name, count)
+    return names
+
+
+def _brute_force_counts(index, prefix, limit):
+    key = normalize(prefix)
+    counts = sorted((c for k, c in index._counts.items() if k.startswith(key)), reverse=True)
+    return counts[:limit]
+
+
+def _prefixes(rng, names):
+    keys = list(names)
+    return ["", "a", "z", "ab", "zz"] + [k[: rng.randint(1, len(k))] for k in rng.sample(keys, 100)]
+
+
+@pytest.mark.parametrize("share_one", [1.0, 0.8, 0.0])
+def test_matches_brute_force(share_one):
+    rng = random.Random(share_one)
+    names = _random_names(rng, 1500, share_one)
+    index = PrefixIndex(small_range=16, top_k=12, compact_threshold=10**6)
+    index.load(names)
+
+    assert index._base.top  # short prefixes are precomputed
+    for prefix in _prefixes(rng, names):
+        for limit in (1, 5, 10):
+            got = [count for _, count in index.suggest(prefix, limit)]
+            assert got == _brute_force_counts(index, prefix, limit), prefix
+
+
+def test_pending_changes_are_merged_with_the_base():
+    rng = random.Random(7)
+    names = _random_names(rng, 1500, 0.8)
+    index = PrefixIndex(small_range=16, top_k=12, compact_threshold=10**6)
+    index.load(names)
+
+    displays = [display for display, _ in names.values()]
+    for _ in range(300):
+        index.add([rng.choice(displays)], delta=rng.choice([1, 1, 5, -1]))
+    index.add(["Brand New"] * 50)
+    top = index.suggest("a", 1)[0][0]
+    index.remove([top] * 1000)
+
+    assert index.suggest("brand n") == [("Brand New", 50)]
+    assert top not in [display for display, _ in index.suggest("a", 10)]
+    for prefix in _prefixes(rng, names):
+        got = [count for _, count in index.suggest(prefix, 10)]
+        assert got == _brute_force_counts(index, prefix, 10), prefix
+
+
+def test_falls_back_when_most_precomputed_entries_changed():
+    index = PrefixIndex(small_range=4, top_k=6, compact_threshold=10**6)
+    index.load({f"a{i:02d}": (f"A{i:02d}", 100 - i) for i in range(40)})
+
+    # Bump the six precomputed leaders past everything else, then drop them again.
+    for i in range(6):
+        index.remove([f"A{i:02d}"] * 1000)
+
+    assert index.suggest("a", 3) == [("A06", 94), ("A07", 93), ("A08", 92)]
+
+
+def test_compaction_folds_the_delta_into_the_base():
+    index = PrefixIndex(small_range=8, top_k=10, compact_threshold=10**6)
+    index.load({normalize(n): (n, 1) for n in (f"{a}{b}" for a in string.ascii_lowercase for b in "xyz")})
+    index.add(["Ax"] * 5 + ["Zed Zero"])
+
+    index._compact()
+
+    assert index._delta == {} and index._delta_sorted == []
+    assert index.suggest("a", 1) == [("ax", 6)]
+    assert index.suggest("zed") == [("Zed Zero", 1)]
+
+
+def test_load_keeps_writes_made_while_counts_were_read():
+    index = PrefixIndex()
+    index.load({"ada": ("Ada", 1)})
+    since = index.version
+    snapshot = {"ada": ("Ada", 1), "bob": ("Bob", 2)}  # read before the write below
+    index.add(["Ada", "Ada"])
+
+    index.load(snapshot, keep_changes_since=since)
+
+    assert index.suggest("a") == [("Ada", 3)]
+    assert index.suggest("b") == [("Bob", 2)]
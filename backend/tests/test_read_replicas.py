@@ -0,0 +1,108 @@
+import shutil
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import database
+from app.config import get_settings
+from app.models import Paper, SavedPaper
+from app.routers import papers, papers_sync
+from app.routers.deps import PRIMARY_PIN_COOKIE
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    """A primary SQLite file, a copy of it as replica, and a replica that cannot be opened."""
+    primary = tmp_path / "primary.db"
+    copy = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{primary}")
+    database.Base.metadata.create_all(engine)
+    engine.dispose()
+    shutil.copy(primary, copy)
+
+    # Mark the copy so reads served by it are recognisable.
+    engine = create_engine(f"sqlite:///{copy}")
+    with Session(engine) as db:
+        paper = Paper(arxiv_id="replica-only", title="Only on the replica")
+        db.add(SavedPaper(paper=paper))
+        db.commit()
+    engine.dispose()
+
+    unreachable = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{primary}")
+    monkeypatch.setenv("DATABASE_REPLICA_URLS", f"{unreachable},sqlite:///{copy}")
+    monkeypatch.setenv("DB_REPLICA_STRATEGY", "round_robin")
+    monkeypatch.setenv("DB_PRIMARY_PIN_SECONDS", "5")
+    get_settings.cache_clear()
+    for name in ("_engine", "_session_factory", "_async_engine", "_async_session_factory", "_replica_router"):
+        monkeypatch.setattr(database, name, None)
+    yield
+    database.dispose_engine()
+    get_settings.cache_clear()
+
+
+def _saved_ids(client):
+    response = client.get("/api/papers/saved")
+    assert response.status_code == 200
+    return [item["paper"]["arxiv_id"] for item in response.json()["items"]]
+
+
+@pytest.mark.parametrize("db_async", [True, False], ids=["async", "sync"])
+def test_reads_use_healthy_replicas_until_the_client_writes(replicas, db_async):
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await database.dispose_async_engine()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(papers.router if db_async else papers_sync.router)
+
+    with TestClient(app) as client:
+        # Unpinned reads are served by the copied replica, whichever one round-robin tries first.
+        for _ in range(3):
+            assert _saved_ids(client) == ["replica-only"]
+
+        router = database.get_replica_router()
+        unreachable, copy = router.replicas
+        assert unreachable.down_until > time.monotonic()
+        assert unreachable.latency is None and copy.latency is not None
+        assert router.candidates() == [copy]
+
+        # The write goes to the primary and pins this client's reads there.
+        response = client.post("/api/papers/save", json={"paper": {"arxiv_id": "2401.00001", "title": "Fresh"}})
+        assert response.status_code == 201
+        assert PRIMARY_PIN_COOKIE in response.cookies
+        assert _saved_ids(client) == ["2401.00001"]
+
+        saved_id = response.json()["id"]
+        assert client.get(f"/api/papers/{saved_id}").json()["paper"]["arxiv_id"] == "2401.00001"
+
+        # Other clients still read from the replica, which has not seen the write.
+        client.cookies.clear()
+        assert _saved_ids(client) == ["replica-only"]
+
+
+def test_round_robin_rotates_and_skips_replicas_that_are_down():
+    router = database.ReplicaRouter(["sqlite:///a.db", "sqlite:///b.db", "sqlite:///c.db"], "round_robin", 30)
+    a, b, c = router.replicas
+    assert [router.candidates() for _ in range(3)] == [[a, b, c], [b, c, a], [c, a, b]]
+
+    router.mark_down(b, RuntimeError("unreachable"))
+    assert all(b not in router.candidates() for _ in range(3))
+
+    b.down_until = time.monotonic() - 1  # the skip window has passed
+    assert any(router.candidates()[0] is b for _ in range(3))
+
+
+def test_least_latency_prefers_unmeasured_then_fastest_replica():
+    router = database.ReplicaRouter(["sqlite:///a.db", "sqlite:///b.db"], "least_latency", 30)
+    a, b = router.replicas
+    router.record_latency(a, 0.010)
+    assert router.candidates() == [b, a]
+    router.record_latency(b, 0.050)
+    assert router.candidates() == [a, b]